@@ -23,6 +23,8 @@ class Settings(BaseSettings):
     secret_key: str = "dev-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 1440  # 24 hours
+    password_scheme: str = "bcrypt"  # or "argon2" (needs argon2-cffi)
+    bcrypt_rounds: int = 12  # Each step doubles hashing time - tests use 4
     
     # Database - SQLite by default, zero config
     database_url: str = "sqlite:///./attentionsync.db"
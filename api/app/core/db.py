@@ -3,7 +3,7 @@ Simple database setup
 SQLite for development, PostgreSQL for production
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -28,6 +28,23 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base class for models
 Base = declarative_base()
 
+# Columns added after their table first shipped - create_all never alters
+# an existing table, so upgrade_db adds these by hand
+ADDED_COLUMNS = {
+    "sources": {
+        "etag": "VARCHAR(500)",
+        "last_modified": "VARCHAR(100)",
+    },
+}
+
+# Indexes added after their table first shipped - same story as ADDED_COLUMNS
+ADDED_INDEXES = {
+    "items": {
+        # Worker ingest looks up known URLs per source in one IN query
+        "ix_items_source_url": ("source_id", "url"),
+    },
+}
+
 
 def get_db():
     """Get database session"""
@@ -45,9 +62,33 @@ def init_db():
     
     # Create tables
     Base.metadata.create_all(bind=engine)
+    upgrade_db()
     print("Database initialized")
 
 
+def upgrade_db():
+    """Add columns and indexes that newer models expect to tables created by older ones"""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, columns in ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for name, column_type in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}"))
+                    print(f"Added column {table}.{name}")
+        
+        for table, indexes in ADDED_INDEXES.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {index["name"] for index in inspector.get_indexes(table)}
+            for name, columns in indexes.items():
+                if name not in existing:
+                    conn.execute(text(f"CREATE INDEX {name} ON {table} ({', '.join(columns)})"))
+                    print(f"Added index {table}.{name}")
+
+
 async def init_db_async():
     """Async version for FastAPI"""
     init_db()
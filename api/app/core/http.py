@@ -0,0 +1,60 @@
+"""
+Shared HTTP client session
+One connection pool per process - keep-alive and DNS cache outlive a single fetch
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "AttentionSync/1.0 (+https://github.com/attentionsync/attentionsync)"
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Get the shared session, creating it on first use in the running loop"""
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    # A session is bound to the loop that created it; a new loop needs a new pool
+    if _session is None or _session.closed or _session_loop is not loop:
+        if _session is not None and not _session.closed:
+            # Its loop is gone or elsewhere, so it cannot be awaited closed from here
+            logger.warning(
+                "Dropping HTTP session left open by another event loop - "
+                "call close_http_session() before that loop ends"
+            )
+        connector = aiohttp.TCPConnector(
+            limit=200,
+            limit_per_host=8,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept-Encoding": "gzip, deflate"
+            }
+        )
+        _session_loop = loop
+
+    return _session
+
+
+async def close_http_session():
+    """Close the shared session - call once on shutdown"""
+    global _session, _session_loop
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
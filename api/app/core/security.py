@@ -11,12 +11,18 @@ from passlib.context import CryptContext
 
 from app.core.config import get_settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # Settings
 settings = get_settings()
 
+# Password hashing - one context for the whole app, cost comes from settings.
+# Hashes in the non-default scheme still verify and get flagged for rehash.
+pwd_context = CryptContext(
+    schemes=["bcrypt", "argon2"],
+    default=settings.password_scheme,
+    bcrypt__rounds=settings.bcrypt_rounds,
+    deprecated="auto"
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against hash"""
@@ -30,14 +36,16 @@ def get_password_hash(password: str) -> str:
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT token"""
-    to_encode = data.copy()
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.jwt_expire_minutes)
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.jwt_algorithm)
+    encoded_jwt = jwt.encode(
+        {**data, "exp": expire},
+        settings.secret_key,
+        algorithm=settings.jwt_algorithm
+    )
     return encoded_jwt
 
 
@@ -10,6 +10,7 @@ import logging
 
 from app.core.config import get_settings
 from app.core.db import init_db_async
+from app.services.rss import rss_parser
 
 # Simple, direct logging - no JSON nonsense in development
 logging.basicConfig(
@@ -26,6 +27,7 @@ async def lifespan(app: FastAPI):
     await init_db_async()
     yield
     logger.info("Shutting down")
+    await rss_parser.aclose()
 
 
 def create_app() -> FastAPI:
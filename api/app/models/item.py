@@ -65,6 +65,7 @@ class Item(BaseModel):
         Index("ix_items_published_at", "published_at"),
         Index("ix_items_importance_score", "importance_score"),
         Index("ix_items_source_published", "source_id", "published_at"),
+        Index("ix_items_source_url", "source_id", "url"),
         Index("ix_items_processed", "is_processed"),
         Index("ix_items_duplicate", "is_duplicate"),
     )
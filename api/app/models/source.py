@@ -54,6 +54,10 @@ class Source(BaseModel):
     last_error_at = Column(DateTime, nullable=True)
     last_error_message = Column(Text, nullable=True)
     
+    # HTTP cache validators from the last fetch - sent back as a conditional GET
+    etag = Column(String(500), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    
     # Fetch statistics
     total_items = Column(Integer, default=0, nullable=False)
     success_count = Column(Integer, default=0, nullable=False)
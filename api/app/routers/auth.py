@@ -9,20 +9,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 import structlog
 
 from app.core.config import get_settings
 from app.core.db import get_db
 from app.core.exceptions import AuthenticationError, ValidationError
+from app.core.security import pwd_context
 from app.models.user import User
 from app.schemas.auth import UserCreate, UserLogin, Token, UserResponse
 
 logger = structlog.get_logger()
 router = APIRouter()
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -38,18 +37,15 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     settings = get_settings()
-    to_encode = data.copy()
     
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.jwt_expire_minutes)
     
-    to_encode.update({"exp": expire})
-    
     encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.jwt_secret, 
+        {**data, "exp": expire}, 
+        settings.secret_key, 
         algorithm=settings.jwt_algorithm
     )
     
@@ -72,7 +68,7 @@ async def get_current_user(
     try:
         payload = jwt.decode(
             credentials.credentials,
-            settings.jwt_secret,
+            settings.secret_key,
             algorithms=[settings.jwt_algorithm]
         )
         user_id: int = payload.get("sub")
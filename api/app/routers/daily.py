@@ -2,12 +2,14 @@
 Daily digest and 3-minute reading routes
 """
 
+import heapq
 from datetime import datetime, timedelta
+from operator import itemgetter
 from typing import List
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func, desc
+from sqlalchemy import select, and_, or_, func, desc
 from sqlalchemy.orm import selectinload
 import structlog
 
@@ -62,12 +64,8 @@ async def get_daily_digest(
         all_items
     )
     
-    # Sort by personalized score and take top items
-    top_items = sorted(
-        scored_items,
-        key=lambda x: x["score"],
-        reverse=True
-    )[:limit]
+    # Take top items by personalized score - a bounded heap, not a full sort
+    top_items = heapq.nlargest(limit, scored_items, key=itemgetter("score"))
     
     # Convert to response format
     digest_items = []
@@ -109,8 +107,13 @@ async def get_daily_stats(
     start_time = datetime.combine(date, datetime.min.time())
     end_time = start_time + timedelta(days=1)
     
-    # Count items by various metrics
-    base_query = select(func.count(Item.id)).join(Source).where(
+    # Count items by various metrics - one scan, one round-trip
+    stats_query = select(
+        func.count(Item.id),
+        func.count(Item.id).filter(Item.is_processed == True),
+        func.count(Item.id).filter(Item.importance_score >= 0.7),
+        func.count(Item.id).filter(or_(Item.has_video == True, Item.has_audio == True))
+    ).join(Source).where(
         and_(
             Source.user_id == current_user.id,
             Item.published_at >= start_time,
@@ -118,22 +121,9 @@ async def get_daily_stats(
         )
     )
     
-    # Total items
-    total_items = (await db.execute(base_query)).scalar()
-    
-    # Processed items
-    processed_query = base_query.where(Item.is_processed == True)
-    processed_items = (await db.execute(processed_query)).scalar()
-    
-    # High importance items
-    high_importance_query = base_query.where(Item.importance_score >= 0.7)
-    high_importance_items = (await db.execute(high_importance_query)).scalar()
-    
-    # Items with video/audio
-    media_query = base_query.where(
-        or_(Item.has_video == True, Item.has_audio == True)
-    )
-    media_items = (await db.execute(media_query)).scalar()
+    total_items, processed_items, high_importance_items, media_items = (
+        await db.execute(stats_query)
+    ).one()
     
     return {
         "date": date,
@@ -2,6 +2,7 @@
 Items management routes
 """
 
+from collections import Counter
 from typing import List
 
 from fastapi import APIRouter, Depends, Query
@@ -173,20 +174,15 @@ async def get_trending_topics(
     items = result.scalars().all()
     
     # Count topic frequencies
-    topic_counts = {}
-    for item in items:
-        if item.topics:
-            for topic_data in item.topics:
-                if isinstance(topic_data, dict) and "name" in topic_data:
-                    topic_name = topic_data["name"]
-                    topic_counts[topic_name] = topic_counts.get(topic_name, 0) + 1
-    
-    # Sort by frequency and return top topics
-    trending_topics = sorted(
-        topic_counts.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:limit]
+    topic_counts = Counter(
+        topic_data["name"]
+        for item in items if item.topics
+        for topic_data in item.topics
+        if isinstance(topic_data, dict) and "name" in topic_data
+    )
+    
+    # Top topics by frequency - heap selection instead of sorting every topic
+    trending_topics = topic_counts.most_common(limit)
     
     return [
         {"topic": topic, "count": count}
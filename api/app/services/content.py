@@ -5,12 +5,28 @@ Content processing - Linus style: Transform data, don't complicate it.
 
 import hashlib
 import logging
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 import re
+from collections import Counter
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import - these run for every item in a batch
+# Script/style blocks and tags in one alternation - a single scan over the HTML
+_MARKUP_RE = re.compile(
+    r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>|<[^>]+>',
+    re.DOTALL
+)
+_SENTENCE_RE = re.compile(r'[^.!?]+')
+_WORD_RE = re.compile(r'\b[a-z]+\b')
+
+# Common words to ignore in keyword extraction
+_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at',
+    'to', 'for', 'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were'
+})
+
 
 class ContentProcessor:
     """Process content - no strategies, no adapters, just functions"""
@@ -18,11 +34,8 @@ class ContentProcessor:
     @staticmethod
     def extract_text(html: str) -> str:
         """Extract text from HTML - simple regex, good enough"""
-        # Remove script and style elements
-        text = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL)
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        # Remove script and style elements, then any remaining tags
+        text = _MARKUP_RE.sub('', html)
         # Clean whitespace
         text = ' '.join(text.split())
         return text
@@ -38,60 +51,63 @@ class ContentProcessor:
         if len(text) <= max_length:
             return text
         
-        # Find sentence boundaries
-        sentences = re.split(r'[.!?]+', text)
-        summary = ""
+        # Walk sentences lazily - stop as soon as the budget is spent,
+        # without splitting the rest of a long article
+        parts = []
+        length = 0
         
-        for sentence in sentences:
-            sentence = sentence.strip()
+        for match in _SENTENCE_RE.finditer(text):
+            sentence = match.group().strip()
             if not sentence:
                 continue
             
-            if len(summary) + len(sentence) > max_length:
+            if length + len(sentence) > max_length:
                 break
             
-            summary += sentence + ". "
+            parts.append(sentence)
+            length += len(sentence) + 2  # ". " separator
         
-        return summary.strip() or text[:max_length] + "..."
+        if not parts:
+            return text[:max_length] + "..."
+        return ". ".join(parts) + "."
     
     @staticmethod
     def extract_keywords(text: str, max_keywords: int = 5) -> List[str]:
         """Extract keywords - simple word frequency"""
-        # Common words to ignore
-        stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 
-                    'to', 'for', 'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were'}
-        
-        # Tokenize and count
-        words = re.findall(r'\b[a-z]+\b', text.lower())
-        word_freq = {}
+        # Tokenize and count - Counter does the per-word loop in C
+        word_freq = Counter(_WORD_RE.findall(text.lower()))
         
-        for word in words:
-            if len(word) > 3 and word not in stopwords:
-                word_freq[word] = word_freq.get(word, 0) + 1
+        # Filter the distinct words, not every occurrence
+        for word in list(word_freq):
+            if len(word) <= 3 or word in _STOPWORDS:
+                del word_freq[word]
         
         # Return top keywords
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, _ in sorted_words[:max_keywords]]
+        return [word for word, _ in word_freq.most_common(max_keywords)]
 
 
-def process_item(raw_content: Dict[str, Any]) -> Dict[str, Any]:
-    """Process a content item - one function, clear flow"""
+def _extract_content(raw_content: Dict[str, Any]) -> Tuple[str, str]:
+    """Plain text and its hash - the cheap part, enough to spot duplicates"""
+    raw_text = raw_content.get('content', '')
+    if raw_content.get('is_html'):
+        text = ContentProcessor.extract_text(raw_text)
+    else:
+        text = raw_text
+    
+    return text, ContentProcessor.generate_hash(text)
+
+
+def _build_item(raw_content: Dict[str, Any], text: str, content_hash: str,
+                now: datetime) -> Dict[str, Any]:
+    """Derive summary and keywords and assemble the processed item"""
     processor = ContentProcessor()
     
     # Extract basic fields - with defaults
     title = raw_content.get('title', 'Untitled')
     url = raw_content.get('url', '')
-    published = raw_content.get('published', datetime.now())
-    
-    # Process content
-    raw_text = raw_content.get('content', '')
-    if raw_content.get('is_html'):
-        text = processor.extract_text(raw_text)
-    else:
-        text = raw_text
+    published = raw_content['published'] if 'published' in raw_content else now
     
     # Generate derived fields
-    content_hash = processor.generate_hash(text)
     summary = processor.summarize(text)
     keywords = processor.extract_keywords(text)
     
@@ -103,28 +119,36 @@ def process_item(raw_content: Dict[str, Any]) -> Dict[str, Any]:
         'keywords': keywords,
         'content_hash': content_hash,
         'published_at': published,
-        'processed_at': datetime.now()
+        'processed_at': now
     }
 
 
+def process_item(raw_content: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Process a content item - one function, clear flow"""
+    text, content_hash = _extract_content(raw_content)
+    return _build_item(raw_content, text, content_hash, now or datetime.now())
+
+
 def batch_process(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Process multiple items - no parallelism complexity"""
     processed = []
     seen_hashes = set()
+    now = datetime.now()  # One timestamp for the whole batch
     
     for item in items:
         try:
-            result = process_item(item)
+            text, content_hash = _extract_content(item)
+            
+            # Simple deduplication - before summarizing, so a duplicate costs one hash
+            if content_hash in seen_hashes:
+                logger.debug(f"Duplicate content skipped: {item.get('title', 'Untitled')}")
+                continue
             
-            # Simple deduplication
-            if result['content_hash'] not in seen_hashes:
-                processed.append(result)
-                seen_hashes.add(result['content_hash'])
-            else:
-                logger.debug(f"Duplicate content skipped: {result['title']}")
+            seen_hashes.add(content_hash)
+            processed.append(_build_item(item, text, content_hash, now))
                 
         except Exception as e:
             logger.error(f"Failed to process item: {e}")
             continue
     
-    return processed
\ No newline at end of file
+    return processed
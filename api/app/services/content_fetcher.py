@@ -4,17 +4,18 @@ Handles fetching content from various sources (RSS, web pages, etc.)
 """
 
 import asyncio
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Tuple
 from urllib.parse import urljoin, urlparse
 
 import aiohttp
 import feedparser
-from bs4 import BeautifulSoup
+from lxml import etree, html
 from readability import Document
 import structlog
 
 from app.core.config import get_settings
+from app.core.http import get_http_session
 from app.models.source import Source, SourceType
 from app.models.item import Item
 from app.core.exception_handler import (
@@ -24,6 +25,12 @@ from app.core.exception_handler import (
 
 logger = structlog.get_logger()
 
+# Upper bound on a feed body - protects the worker from runaway responses
+MAX_FEED_BYTES = 10 * 1024 * 1024
+
+# Entry content is re-encoded to UTF-8 before parsing, whatever it declares
+_UTF8_HTML_PARSER = html.HTMLParser(encoding="utf-8")
+
 
 class ContentFetcher:
     """Service for fetching content from various sources"""
@@ -33,33 +40,32 @@ class ContentFetcher:
         self.session = None
     
     async def __aenter__(self):
-        """Async context manager entry"""
-        timeout = aiohttp.ClientTimeout(total=30)
-        self.session = aiohttp.ClientSession(
-            timeout=timeout,
-            headers={
-                "User-Agent": "AttentionSync/1.0 (+https://github.com/attentionsync/attentionsync)"
-            }
-        )
+        """Async context manager entry - borrow the process-wide session"""
+        self.session = get_http_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit - the shared session stays open for reuse"""
+        self.session = None
     
-    async def fetch_source_content(self, source: Source) -> List[Dict[str, Any]]:
-        """Fetch content from a source based on its type"""
+    async def fetch_source_content(
+        self, source: Source
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Optional[str]]]]:
+        """Fetch content from a source based on its type.
+        
+        Returns the items plus the HTTP cache validators (etag, last_modified)
+        to store once those items are saved - None means keep the old ones.
+        """
         try:
             if source.source_type == SourceType.RSS:
                 return await self._fetch_rss_content(source)
             elif source.source_type == SourceType.WEBPAGE:
-                return await self._fetch_webpage_content(source)
+                return await self._fetch_webpage_content(source), None
             elif source.source_type == SourceType.VIDEO:
-                return await self._fetch_video_content(source)
+                return await self._fetch_video_content(source), None
             else:
                 logger.warning("Unsupported source type", source_type=source.source_type)
-                return []
+                return [], None
                 
         except Exception as e:
             logger.error(
@@ -69,19 +75,61 @@ class ContentFetcher:
                 error=str(e)
             )
             source.record_error(str(e))
-            return []
+            return [], None
+    
+    async def fetch_many(self, sources: List[Source], concurrency: int = 32) -> List[Any]:
+        """Fetch several sources concurrently, at most `concurrency` requests in flight"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(source: Source):
+            async with semaphore:
+                return await self.fetch_source_content(source)
+        
+        return await asyncio.gather(
+            *(fetch_one(source) for source in sources),
+            return_exceptions=True
+        )
     
-    async def _fetch_rss_content(self, source: Source) -> List[Dict[str, Any]]:
+    async def _fetch_rss_content(
+        self, source: Source
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Optional[str]]]]:
         """Fetch content from RSS feed"""
         try:
-            async with self.session.get(source.url) as response:
+            # Conditional GET - unchanged feeds come back as an empty 304
+            request_headers = {}
+            if source.etag:
+                request_headers["If-None-Match"] = source.etag
+            if source.last_modified:
+                request_headers["If-Modified-Since"] = source.last_modified
+            
+            async with self.session.get(source.url, headers=request_headers) as response:
+                if response.status == 304:
+                    logger.debug("RSS feed not modified", source_id=source.id)
+                    source.record_success()
+                    return [], None
+                
                 if response.status != 200:
                     raise Exception(f"HTTP {response.status}: {response.reason}")
                 
-                feed_content = await response.text()
+                # Bytes, not text - feedparser decodes them, honouring the HTTP
+                # charset from Content-Type before sniffing the document
+                feed_content = await self._read_limited(response, MAX_FEED_BYTES)
+                content_type = response.headers.get("Content-Type")
+                # Not stored on the source yet - only once the items are saved,
+                # or a failed run would 304 its entries away for good
+                validators = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified")
+                }
             
-            # Parse RSS feed
-            feed = feedparser.parse(feed_content)
+            # Parse RSS feed - keep feedparser's sanitizing: title and author are
+            # stored as-is, only the content goes through _extract_content_from_entry.
+            # Relative URIs are not needed, the markup is reduced to text anyway.
+            feed = feedparser.parse(
+                feed_content,
+                resolve_relative_uris=False,
+                response_headers={"content-type": content_type} if content_type else None
+            )
             
             if feed.bozo:
                 logger.warning("RSS feed has parsing errors", source_id=source.id)
@@ -110,12 +158,12 @@ class ContentFetcher:
             )
             
             source.record_success()
-            return items
+            return items, validators
             
         except Exception as e:
             logger.error("RSS fetch failed", source_id=source.id, error=str(e))
             source.record_error(str(e))
-            return []
+            return [], None
     
     async def _fetch_webpage_content(self, source: Source) -> List[Dict[str, Any]]:
         """Fetch content from a single webpage"""
@@ -124,31 +172,37 @@ class ContentFetcher:
                 if response.status != 200:
                     raise Exception(f"HTTP {response.status}: {response.reason}")
                 
-                html_content = await response.text()
+                # Raw bytes - lxml and readability detect the charset themselves
+                html_content = await response.read()
             
             # Extract readable content using readability
             doc = Document(html_content)
             
-            # Parse with BeautifulSoup for additional metadata
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # Parse with lxml for additional metadata
+            tree = html.fromstring(html_content)
             
             # Extract title
             title = doc.title() or ""
-            if not title and soup.title:
-                title = soup.title.get_text().strip()
+            if not title:
+                title = (tree.findtext(".//title") or "").strip()
             
             # Extract author from meta tags
-            author = ""
-            author_meta = soup.find("meta", {"name": "author"}) or soup.find("meta", {"property": "article:author"})
-            if author_meta:
-                author = author_meta.get("content", "")
+            author = (
+                self._meta_content(tree, '//meta[@name="author"]/@content')
+                or self._meta_content(tree, '//meta[@property="article:author"]/@content')
+            )
             
             # Extract published date
             published_at = None
-            date_meta = soup.find("meta", {"property": "article:published_time"})
-            if date_meta:
+            date_content = self._meta_content(
+                tree, '//meta[@property="article:published_time"]/@content'
+            )
+            if date_content:
                 try:
-                    published_at = datetime.fromisoformat(date_meta.get("content", "").replace("Z", "+00:00"))
+                    published_at = datetime.fromisoformat(date_content.replace("Z", "+00:00"))
+                    if published_at.tzinfo:
+                        # Normalize to naive UTC so it compares with the rest of the pipeline
+                        published_at = published_at.astimezone(timezone.utc).replace(tzinfo=None)
                 except (ValueError, TypeError) as e:
                     logger.warning(f"Failed to parse published date: {e}")
                     pass
@@ -203,16 +257,13 @@ class ContentFetcher:
                 if response.status != 200:
                     raise Exception(f"HTTP {response.status}")
                 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
+                tree = html.fromstring(await response.read())
                 
                 # Extract title from page title
-                title_tag = soup.find("title")
-                title = title_tag.get_text() if title_tag else "YouTube Video"
+                title = tree.findtext(".//title") or "YouTube Video"
                 
                 # Extract description from meta tag
-                desc_meta = soup.find("meta", {"name": "description"})
-                description = desc_meta.get("content", "") if desc_meta else ""
+                description = self._meta_content(tree, '//meta[@name="description"]/@content')
                 
                 item_data = {
                     "title": title,
@@ -257,23 +308,51 @@ class ContentFetcher:
                 
                 if content and len(content.strip()) > 10:
                     # Clean HTML tags
-                    soup = BeautifulSoup(content, 'html.parser')
-                    return soup.get_text().strip()
+                    try:
+                        # Bytes, not str - lxml rejects a str with an XML encoding
+                        # declaration; the text is already decoded, so it is UTF-8
+                        tree = html.fromstring(content.encode(), parser=_UTF8_HTML_PARSER)
+                        return tree.text_content().strip()
+                    except etree.ParserError:
+                        # Nothing but comments/whitespace - no text to keep
+                        return ""
         
         return ""
     
+    @staticmethod
+    async def _read_limited(response: aiohttp.ClientResponse, limit: int) -> bytes:
+        """Read a response body, refusing anything larger than limit bytes"""
+        if response.content_length and response.content_length > limit:
+            raise Exception(f"Response too large: {response.content_length} bytes")
+        
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            size += len(chunk)
+            if size > limit:
+                raise Exception(f"Response too large: more than {limit} bytes")
+            chunks.append(chunk)
+        
+        return b"".join(chunks)
+    
+    @staticmethod
+    def _meta_content(tree, xpath: str) -> str:
+        """Return the first attribute value matched by an XPath, or empty string"""
+        values = tree.xpath(xpath)
+        return values[0] if values else ""
+    
     def _parse_published_date(self, entry) -> Optional[datetime]:
         """Parse published date from RSS entry"""
         date_fields = ["published", "updated", "created"]
         
         for field in date_fields:
-            if hasattr(entry, field + "_parsed"):
+            time_struct = entry.get(field + "_parsed")
+            if time_struct:
                 try:
-                    time_struct = getattr(entry, field + "_parsed")
-                    if time_struct:
-                        return datetime(*time_struct[:6])
+                    # feedparser normalizes to UTC; stored naive like every other timestamp
+                    return datetime(*time_struct[:6])
                 except (ValueError, OverflowError, OSError) as e:
-                    logger.debug(f"Failed to parse date format {date_format}: {e}")
+                    logger.debug("Failed to parse published date", field=field, error=str(e))
                     continue
         
         return None
\ No newline at end of file
@@ -3,27 +3,70 @@ Simple RSS feed parser
 Does one thing: parse RSS feeds
 """
 
+import asyncio
+import codecs
+import copy
 import hashlib
-from datetime import datetime
+import importlib.util
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from html import escape
 from typing import List, Optional
 
 import feedparser
 import httpx
-from pydantic import BaseModel
 
+try:
+    # feedparser's own cleaner - the lxml path must hand out exactly what it would.
+    # It is private API (requirements pin feedparser==6.0.10); if a release moves
+    # it, every feed simply goes through feedparser instead of the lxml path.
+    from feedparser.sanitizer import _sanitize_html
+except ImportError:
+    _sanitize_html = None
 
-class FeedItem(BaseModel):
-    """Parsed feed item"""
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional - feedparser handles every feed on its own
+    etree = None
+
+logger = logging.getLogger(__name__)
+
+# Entry elements: RSS 2.0, RSS 1.0 (RDF) and Atom
+_ENTRY_TAGS = ("item", "{http://purl.org/rss/1.0/}item", "{http://www.w3.org/2005/Atom}entry")
+_DC_DATE = "{http://purl.org/dc/elements/1.1/}date"
+_RDF_ABOUT = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+_XHTML_DIV = "{http://www.w3.org/1999/xhtml}div"
+_XHTML_TYPES = ("xhtml", "application/xhtml+xml")
+
+# Same cap as the worker's ContentFetcher - larger bodies are refused
+MAX_FEED_BYTES = 10 * 1024 * 1024
+
+# HTTP/2 needs the optional h2 package - fall back to HTTP/1.1 keep-alive without it
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(slots=True)
+class FeedItem:
+    """Parsed feed item - plain data, the parser already produced clean values"""
     title: str
     link: str
     description: Optional[str] = None
     published: Optional[datetime] = None
     guid: Optional[str] = None
+    # Slots rule out cached_property - keep the digest in a hidden field
+    _hash: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def generate_hash(self) -> str:
-        """Generate unique hash for deduplication"""
-        content = f"{self.title}{self.link}"
-        return hashlib.sha256(content.encode()).hexdigest()
+        """Generate unique hash for deduplication - computed once per item"""
+        if self._hash is None:
+            # Same digest as hashing title+link, without building the joined string
+            digest = hashlib.sha256(self.title.encode())
+            digest.update(self.link.encode())
+            self._hash = digest.hexdigest()
+        return self._hash
 
 
 class RSSParser:
@@ -31,44 +74,259 @@ class RSSParser:
     
     def __init__(self, timeout: int = 30):
         self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Shared client - keep-alive connections outlive a single fetch"""
+        loop = asyncio.get_running_loop()
+        # Pooled connections belong to the loop that opened them
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            if self._client is not None and not self._client.is_closed:
+                # Its loop is gone or elsewhere, so it cannot be awaited closed from here
+                logger.warning(
+                    "Dropping RSS client left open by another event loop - "
+                    "call rss_parser.aclose() before that loop ends"
+                )
+            self._client = httpx.AsyncClient(
+                http2=_HTTP2,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100)
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared client - call before its event loop ends.
+        
+        The client is bound to one loop; code that drives fetches from its own
+        loop (asyncio.run in a script or task) must await aclose() before
+        that loop finishes, just like the API lifespan does on shutdown.
+        """
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
     
     async def fetch_feed(self, url: str) -> List[FeedItem]:
         """Fetch and parse RSS feed"""
         try:
-            # Fetch feed content
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=self.timeout)
-                response.raise_for_status()
+            items = []
+            chunks = []
             
-            # Parse feed
-            feed = feedparser.parse(response.text)
+            client = await self._get_client()
+            async with client.stream("GET", url, timeout=self.timeout) as response:
+                response.raise_for_status()
+                length = response.headers.get("content-length")
+                if length and length.isdigit() and int(length) > MAX_FEED_BYTES:
+                    raise Exception(f"Response too large: {length} bytes")
+                # Charset from Content-Type, if any - parsers then skip sniffing
+                encoding = response.charset_encoding
+                content_type = response.headers.get("content-type", "")
+                
+                # Stream the body into lxml as it arrives - no full DOM, no str copy
+                parser = self._new_pull_parser(encoding)
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > MAX_FEED_BYTES:
+                        raise Exception(f"Response too large: more than {MAX_FEED_BYTES} bytes")
+                    # The raw bytes are retained for the feedparser fallback, so
+                    # peak memory is the (capped) body size even on the lxml path
+                    chunks.append(chunk)
+                    if parser is None:
+                        continue
+                    try:
+                        parser.feed(chunk)
+                        items.extend(self._read_entries(parser))
+                    except etree.XMLSyntaxError:
+                        parser = None
             
-            # Convert to FeedItem objects
-            items = []
-            for entry in feed.entries:
-                item = FeedItem(
-                    title=entry.get('title', 'No title'),
-                    link=entry.get('link', ''),
-                    description=entry.get('summary', ''),
-                    published=self._parse_date(entry.get('published_parsed')),
-                    guid=entry.get('id', '')
-                )
-                items.append(item)
+            if parser is not None:
+                try:
+                    parser.close()
+                    items.extend(self._read_entries(parser))
+                except etree.XMLSyntaxError:
+                    items = []
+                # No entries from well-formed XML may be a dialect _ENTRY_TAGS
+                # does not list (Atom 0.3, RSS 0.90) - let feedparser decide
+                if items:
+                    return items
             
-            return items
+            # Not well-formed XML, no known entries (or no lxml) - feedparser copes
+            # It is slow, so run it off the loop and let other fetches proceed
+            content = b"".join(chunks)
+            return await asyncio.to_thread(self._parse_with_feedparser, content, content_type)
             
         except Exception as e:
-            print(f"Error fetching feed {url}: {e}")
+            logger.warning("fetch_feed failed url=%s err=%s", url, e)
             return []
     
+    async def fetch_many(self, urls: List[str], concurrency: int = 32) -> List[List[FeedItem]]:
+        """Fetch many feeds concurrently - results in the same order as urls"""
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def one(url: str) -> List[FeedItem]:
+            async with sem:
+                return await self.fetch_feed(url)
+        
+        # fetch_feed turns every failure into an empty list, so nothing here raises
+        return await asyncio.gather(*(one(url) for url in urls))
+    
+    def _new_pull_parser(self, encoding: Optional[str] = None):
+        """Incremental parser that reports only finished entry elements"""
+        if etree is None or _sanitize_html is None:
+            return None
+        if encoding:
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                encoding = None  # Bogus charset header - read the XML declaration instead
+        return etree.XMLPullParser(
+            events=("end",), tag=_ENTRY_TAGS, resolve_entities=False, encoding=encoding
+        )
+    
+    def _read_entries(self, parser) -> List[FeedItem]:
+        """Turn the entries completed so far into FeedItems, then free them"""
+        items = []
+        for _, elem in parser.read_events():
+            items.append(self._entry_to_item(elem))
+            
+            # Drop the parsed entry and its predecessors - the tree stays small
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        return items
+    
+    def _entry_to_item(self, elem) -> FeedItem:
+        """Build a FeedItem from an RSS <item> or Atom <entry>"""
+        ns = elem.tag[:elem.tag.index("}") + 1] if elem.tag.startswith("{") else ""
+        atom = elem.tag.endswith("entry")
+        
+        def text(tag: str) -> Optional[str]:
+            value = elem.findtext(tag)
+            return value.strip() if value is not None else None
+        
+        def markup(tag: str) -> Optional[str]:
+            # Human-readable fields may carry HTML - clean it like feedparser does
+            node = elem.find(tag)
+            if node is None:
+                return None
+            if node.get("type") in _XHTML_TYPES:
+                value = _xhtml_inner(node)  # Markup is child elements, not text
+            else:
+                value = (node.text or "").strip()
+            return _clean_html(value) if value else value
+        
+        if atom:
+            link = ""
+            for link_elem in elem.iterfind(ns + "link"):
+                if link_elem.get("rel", "alternate") == "alternate":
+                    link = link_elem.get("href", "")
+                    break
+            description = markup(ns + "summary") or markup(ns + "content")
+            published = text(ns + "published") or text(ns + "updated")
+            guid = text(ns + "id")
+        else:
+            link = text(ns + "link") or ""
+            description = markup(ns + "description")
+            published = text(ns + "pubDate") or text(_DC_DATE)
+            guid = text(ns + "guid") or elem.get(_RDF_ABOUT)
+            if not link and guid:
+                # A permalink guid doubles as the link, as in feedparser -
+                # otherwise items would dedupe on their title alone
+                guid_elem = elem.find(ns + "guid")
+                if guid_elem is not None and guid_elem.get("isPermaLink", "true") != "false":
+                    link = guid
+        
+        title = markup(ns + "title")
+        return FeedItem(
+            title=title if title is not None else 'No title',
+            link=link,
+            description=description or '',
+            published=self._parse_date_text(published),
+            guid=guid or ''
+        )
+    
+    def _parse_with_feedparser(self, content: bytes, content_type: str = "") -> List[FeedItem]:
+        """Parse a whole feed document with feedparser"""
+        # feedparser honours the HTTP charset the same way a real fetch would
+        headers = {"content-type": content_type} if content_type else None
+        feed = feedparser.parse(content, response_headers=headers)
+        
+        # Convert to FeedItem objects
+        items = []
+        for entry in feed.entries:
+            date_tuple = entry.get('published_parsed') or entry.get('updated_parsed')
+            item = FeedItem(
+                title=entry.get('title', 'No title'),
+                link=entry.get('link', ''),
+                description=entry.get('summary', ''),
+                # feedparser files dc:date and Atom <updated> under 'updated'
+                published=(
+                    self._parse_date_text(entry.get('published') or entry.get('updated'))
+                    or self._parse_date(date_tuple)
+                ),
+                guid=entry.get('id', '')
+            )
+            items.append(item)
+        
+        return items
+    
+    def _parse_date_text(self, value: Optional[str]) -> Optional[datetime]:
+        """Parse an RFC 822 (RSS) or ISO 8601 (Atom) date into naive UTC"""
+        if not value:
+            return None
+        return _parse_date_string(value)
+    
     def _parse_date(self, date_tuple) -> Optional[datetime]:
         """Parse date from feed"""
-        if date_tuple:
-            try:
-                return datetime(*date_tuple[:6])
-            except:
-                pass
-        return None
+        if not date_tuple or len(date_tuple) < 6:
+            return None
+        try:
+            # Cheap month check first; a non-int field raises TypeError here too
+            if not 1 <= date_tuple[1] <= 12:
+                return None
+            return datetime(*date_tuple[:6])
+        except (TypeError, ValueError):
+            return None
+
+
+def _xhtml_inner(node) -> str:
+    """Serialize an Atom type="xhtml" construct: the children of its wrapper div"""
+    container = node.find(_XHTML_DIV)
+    container = copy.deepcopy(container if container is not None else node)
+    
+    # Plain tag names, as feedparser emits them - no xmlns on every element
+    for child in container.iter():
+        if isinstance(child.tag, str) and child.tag.startswith("{"):
+            child.tag = child.tag.split("}", 1)[1]
+    etree.cleanup_namespaces(container)
+    
+    parts = [escape(container.text or "", quote=False)]
+    parts.extend(etree.tostring(child, encoding="unicode") for child in container)
+    return "".join(parts).strip()
+
+
+def _clean_html(value: str) -> str:
+    """Strip scripts, event handlers and other unsafe markup"""
+    if "<" not in value:
+        return value  # Nothing to clean - the sanitizer would return it unchanged
+    return _sanitize_html(value, "utf-8", "text/html")
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(value: str) -> Optional[datetime]:
+    """Parse a feed date string - cached, feeds repeat timestamps a lot"""
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
 
 
 # Simple singleton instance
@@ -3,16 +3,21 @@ Security utilities for AttentionSync
 """
 
 import hashlib
+import re
 import secrets
-from typing import Optional
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
 
-from passlib.context import CryptContext
 from jose import jwt, JWTError
 from datetime import datetime, timedelta
 
 from app.core.config import get_settings
+from app.core.security import pwd_context
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Characters not allowed in stored filenames
+_UNSAFE_FN_RE = re.compile(r'[<>:"/\\|?*]')
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -30,40 +35,56 @@ def generate_secure_token(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
 
 
+@lru_cache()
+def _jwt_config() -> Tuple[str, str, int]:
+    """JWT secret, algorithm and default lifetime - read from settings once"""
+    settings = get_settings()
+    return settings.secret_key, settings.jwt_algorithm, settings.jwt_expire_minutes
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
-    settings = get_settings()
-    to_encode = data.copy()
+    secret, algorithm, expire_minutes = _jwt_config()
     
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.jwt_expire_minutes)
-    
-    to_encode.update({"exp": expire})
+        expire = datetime.utcnow() + timedelta(minutes=expire_minutes)
     
     encoded_jwt = jwt.encode(
-        to_encode,
-        settings.jwt_secret,
-        algorithm=settings.jwt_algorithm
+        {**data, "exp": expire},
+        secret,
+        algorithm=algorithm
     )
     
     return encoded_jwt
 
 
-def verify_token(token: str) -> Optional[dict]:
+def verify_token(token: str) -> Optional[Mapping]:
     """Verify and decode JWT token"""
-    settings = get_settings()
-    
+    now = time.time()
     try:
-        payload = jwt.decode(
-            token,
-            settings.jwt_secret,
-            algorithms=[settings.jwt_algorithm]
-        )
-        return payload
+        # Same token within the same minute - reuse the verified payload
+        payload = _verify_token_cached(token, int(now) // 60)
     except JWTError:
         return None
+    
+    # The cache can outlive the token by up to a minute - check exp ourselves
+    if payload.get("exp", now) < now:
+        return None
+    return payload
+
+
+@lru_cache(maxsize=4096)
+def _verify_token_cached(token: str, bucket: int) -> Mapping:
+    """Decode a token once per minute bucket; read-only since it is shared.
+    
+    Raises JWTError so that rejections are never cached - a token refused
+    for its nbf claim must be accepted as soon as that time has passed.
+    """
+    secret, algorithm, _ = _jwt_config()
+    payload = jwt.decode(token, secret, algorithms=[algorithm])
+    return MappingProxyType(payload)
 
 
 def hash_content(content: str) -> str:
@@ -74,7 +95,6 @@ def hash_content(content: str) -> str:
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe storage"""
     # Remove or replace unsafe characters
-    import re
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = _UNSAFE_FN_RE.sub('_', filename)
     filename = filename.strip('. ')
     return filename[:255]  # Limit length
\ No newline at end of file
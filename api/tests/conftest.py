@@ -9,8 +9,8 @@ import os
 from typing import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, MagicMock
 from httpx import AsyncClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 import redis.asyncio as redis
 
@@ -18,6 +18,7 @@ import redis.asyncio as redis
 os.environ["ENVIRONMENT"] = "testing"
 os.environ["DATABASE_URL"] = "sqlite:///:memory:"
 os.environ["REDIS_URL"] = "redis://localhost:6379/15"  # 使用测试数据库
+os.environ["BCRYPT_ROUNDS"] = "4"  # 最低成本，测试不需要慢哈希
 
 from app.main import create_app
 from app.core.db import get_db, Base
@@ -41,9 +42,9 @@ def settings():
     return get_settings()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def db_engine():
-    """创建测试数据库引擎"""
+    """创建测试数据库引擎（整个测试会话只建一次表）"""
     engine = create_engine(
         "sqlite:///:memory:",
         connect_args={"check_same_thread": False},
@@ -51,6 +52,15 @@ def db_engine():
         echo=False
     )
     
+    # pysqlite 自己管理事务会破坏 SAVEPOINT，交给 SQLAlchemy 控制
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     # 创建所有表
     Base.metadata.create_all(engine)
     
@@ -63,25 +73,35 @@ def db_engine():
 
 @pytest.fixture(scope="function")
 def db_session(db_engine):
-    """创建数据库会话"""
-    TestingSessionLocal = sessionmaker(
-        autocommit=False,
+    """创建数据库会话，测试结束后回滚全部写入"""
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    
+    # 测试里的 commit() 只提交 SAVEPOINT，外层事务最后整体回滚
+    session = Session(
+        bind=connection,
         autoflush=False,
-        bind=db_engine
+        join_transaction_mode="create_savepoint"
     )
     
-    session = TestingSessionLocal()
-    
     try:
         yield session
     finally:
         session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def _app():
+    """创建测试应用（整个会话共用一个，路由和中间件只构建一次）"""
+    return create_app()
 
 
 @pytest.fixture(scope="function")
-def app(db_session):
-    """创建测试应用"""
-    app = create_app()
+def app(_app, db_session):
+    """测试应用，每个测试重新绑定数据库会话"""
+    app = _app
     
     # 重写数据库依赖
     def override_get_db():
@@ -142,15 +162,21 @@ def sample_user_data():
     }
 
 
-@pytest.fixture(scope="function")
-def sample_user(db_session, sample_user_data):
-    """创建示例用户"""
+@pytest.fixture(scope="session")
+def _test_password_hash():
+    """测试密码的哈希，整个会话只计算一次"""
     from app.utils.security import get_password_hash
     
+    return get_password_hash("testpassword123")
+
+
+@pytest.fixture(scope="function")
+def sample_user(db_session, sample_user_data, _test_password_hash):
+    """创建示例用户"""
     user = User(
         email=sample_user_data["email"],
         username=sample_user_data["username"],
-        password_hash=get_password_hash(sample_user_data["password"]),
+        password_hash=_test_password_hash,
         full_name=sample_user_data["full_name"],
         is_active=True,
         is_verified=True
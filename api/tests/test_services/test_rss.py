@@ -0,0 +1,333 @@
+"""
+RSS 解析器测试
+"""
+
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.services import rss
+from app.services.rss import RSSParser
+
+
+RSS2_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Example</title>
+    <item>
+      <title>  First post  </title>
+      <link>https://example.com/1</link>
+      <description>
+        &lt;p onclick="steal()"&gt;Hello&lt;script&gt;alert(1)&lt;/script&gt;&lt;/p&gt;
+      </description>
+      <pubDate>Tue, 10 Jun 2003 04:00:00 +0200</pubDate>
+      <guid>post-1</guid>
+    </item>
+    <item>
+      <link>https://example.com/2</link>
+    </item>
+  </channel>
+</rss>
+"""
+
+RDF_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/"
+         xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel rdf:about="https://example.com/">
+    <title>Example</title>
+  </channel>
+  <item rdf:about="https://example.com/rdf">
+    <title>RDF post</title>
+    <link>https://example.com/rdf</link>
+    <description>Plain text</description>
+    <dc:date>2024-01-02T03:04:05+08:00</dc:date>
+  </item>
+</rdf:RDF>
+"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example</title>
+  <entry>
+    <title>Atom post</title>
+    <link rel="self" href="https://example.com/self"/>
+    <link href="https://example.com/atom"/>
+    <id>urn:uuid:1234</id>
+    <published>2024-01-01T10:00:00Z</published>
+    <summary type="html">&lt;b&gt;Bold&lt;/b&gt;&lt;script&gt;alert(1)&lt;/script&gt;</summary>
+  </entry>
+</feed>
+"""
+
+# 没有 <link> 时，永久链接 guid 就是链接
+GUID_LINK_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0">
+  <channel>
+    <item><title>Same</title><guid>https://example.com/g1</guid></item>
+    <item><title>Same</title><guid isPermaLink="true">https://example.com/g2</guid></item>
+    <item><title>Same</title><guid isPermaLink="false">tag:example.com,3</guid></item>
+  </channel>
+</rss>
+"""
+
+# 标题里带 HTML，必须和描述一样被清理
+HTML_TITLE_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <title type="html">&lt;img src=x onerror=alert(1)&gt;Hi</title>
+    <link href="https://example.com/title"/>
+    <id>urn:uuid:title</id>
+  </entry>
+</feed>
+"""
+
+# xhtml 内容是子元素而不是文本
+XHTML_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <title type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml">A <b>bold</b> title</div></title>
+    <link href="https://example.com/summary"/>
+    <summary type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml"><p>Body</p></div></summary>
+  </entry>
+  <entry>
+    <title>Content only</title>
+    <link href="https://example.com/content"/>
+    <content type="xhtml">
+      <div xmlns="http://www.w3.org/1999/xhtml"><p onclick="x()">Body &amp; <i>x</i></p> tail</div>
+    </content>
+  </entry>
+</feed>
+"""
+
+# Atom 0.3 的命名空间不在增量解析器的条目标签里
+ATOM03_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed version="0.3" xmlns="http://purl.org/atom/ns#">
+  <title>Example</title>
+  <entry>
+    <title>Old atom</title>
+    <link rel="alternate" type="text/html" href="https://example.com/atom03"/>
+    <id>urn:uuid:0.3</id>
+  </entry>
+</feed>
+"""
+
+# 未转义的 & 让文档不是合法 XML，只能交给 feedparser
+MALFORMED_FEED = b"""<rss version="2.0"><channel><title>Broken & co</title>
+<item><title>Still readable</title><link>https://example.com/broken</link></item>
+</channel></rss>"""
+
+
+def parse_chunked(parser: RSSParser, document: bytes, chunk_size: int):
+    """按块喂给增量解析器，模拟网络流"""
+    pull_parser = parser._new_pull_parser()
+    items = []
+    for start in range(0, len(document), chunk_size):
+        pull_parser.feed(document[start:start + chunk_size])
+        items.extend(parser._read_entries(pull_parser))
+    pull_parser.close()
+    items.extend(parser._read_entries(pull_parser))
+    return items
+
+
+def mock_parser(body: bytes, content_type: str = "application/rss+xml") -> RSSParser:
+    """返回一个通过 MockTransport 提供固定响应的解析器"""
+    def handler(request):
+        return httpx.Response(200, content=body, headers={"content-type": content_type})
+    
+    parser = RSSParser()
+    parser._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    parser._client_loop = asyncio.get_running_loop()
+    return parser
+
+
+class TestStreamingParser:
+    """测试 lxml 增量解析路径"""
+    
+    def test_rss2_feed(self):
+        """测试 RSS 2.0 条目"""
+        first, second = parse_chunked(RSSParser(), RSS2_FEED, len(RSS2_FEED))
+        
+        assert first.title == "First post"
+        assert first.link == "https://example.com/1"
+        assert first.guid == "post-1"
+        # pubDate 转为不带时区的 UTC
+        assert first.published == datetime(2003, 6, 10, 2, 0)
+        
+        assert second.title == "No title"
+        assert second.published is None
+    
+    def test_rdf_feed_dc_date(self):
+        """测试 RSS 1.0 (RDF) 条目和 dc:date"""
+        items = parse_chunked(RSSParser(), RDF_FEED, len(RDF_FEED))
+        
+        assert len(items) == 1
+        assert items[0].title == "RDF post"
+        assert items[0].link == "https://example.com/rdf"
+        assert items[0].description == "Plain text"
+        # RDF 条目没有 guid，用 rdf:about
+        assert items[0].guid == "https://example.com/rdf"
+        assert items[0].published == datetime(2024, 1, 1, 19, 4, 5)
+    
+    def test_atom_feed(self):
+        """测试 Atom 条目"""
+        items = parse_chunked(RSSParser(), ATOM_FEED, len(ATOM_FEED))
+        
+        assert len(items) == 1
+        assert items[0].title == "Atom post"
+        # 只取 rel=alternate 的链接
+        assert items[0].link == "https://example.com/atom"
+        assert items[0].guid == "urn:uuid:1234"
+        assert items[0].published == datetime(2024, 1, 1, 10, 0)
+    
+    @pytest.mark.parametrize("document", [RSS2_FEED, RDF_FEED, ATOM_FEED])
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64])
+    def test_chunked_matches_whole(self, document, chunk_size):
+        """测试分块输入与一次性输入结果一致"""
+        parser = RSSParser()
+        
+        assert parse_chunked(parser, document, chunk_size) == \
+            parse_chunked(parser, document, len(document))
+    
+    @pytest.mark.parametrize("document", [RSS2_FEED, RDF_FEED, ATOM_FEED])
+    def test_matches_feedparser(self, document):
+        """测试两条解析路径输出相同（包括 HTML 清理）"""
+        parser = RSSParser()
+        
+        assert parse_chunked(parser, document, 16) == parser._parse_with_feedparser(document)
+    
+    def test_description_sanitized(self):
+        """测试描述中的脚本和事件属性被清理"""
+        first = parse_chunked(RSSParser(), RSS2_FEED, 32)[0]
+        
+        assert first.description == "<p>Hello</p>"
+    
+    def test_xhtml_content(self):
+        """测试 type="xhtml" 的标题、摘要和正文被序列化并清理"""
+        parser = RSSParser()
+        first, second = parse_chunked(parser, XHTML_FEED, 16)
+        
+        assert first.title == "A <b>bold</b> title"
+        assert first.description == "<p>Body</p>"
+        assert second.description == "<p>Body &amp; <i>x</i></p> tail"
+        assert [first.description, second.description] == \
+            [item.description for item in parser._parse_with_feedparser(XHTML_FEED)]
+    
+    def test_permalink_guid_as_link(self):
+        """测试没有 link 的条目使用永久链接 guid，同标题条目不会哈希冲突"""
+        parser = RSSParser()
+        items = parse_chunked(parser, GUID_LINK_FEED, 16)
+        
+        assert [item.link for item in items] == \
+            ["https://example.com/g1", "https://example.com/g2", ""]
+        assert items[0].generate_hash() != items[1].generate_hash()
+        assert [item.link for item in items] == \
+            [item.link or "" for item in parser._parse_with_feedparser(GUID_LINK_FEED)]
+    
+    def test_html_title_sanitized(self):
+        """测试 type="html" 标题中的事件属性被清理，与 feedparser 一致"""
+        parser = RSSParser()
+        items = parse_chunked(parser, HTML_TITLE_FEED, 16)
+        
+        assert items[0].title == '<img src="x" />Hi'
+        assert items == parser._parse_with_feedparser(HTML_TITLE_FEED)
+
+
+class TestDateParsing:
+    """测试日期解析"""
+    
+    def test_rfc822_and_iso8601(self):
+        """测试 pubDate 和 ISO 8601 日期"""
+        parser = RSSParser()
+        
+        rfc822 = parser._parse_date_text("Tue, 10 Jun 2003 04:00:00 GMT")
+        iso8601 = parser._parse_date_text("2024-01-01T10:00:00Z")
+        
+        assert rfc822 == datetime(2003, 6, 10, 4, 0)
+        assert iso8601 == datetime(2024, 1, 1, 10, 0)
+    
+    def test_invalid_dates(self):
+        """测试无法解析的日期返回 None"""
+        parser = RSSParser()
+        
+        assert parser._parse_date_text("not a date") is None
+        assert parser._parse_date_text("") is None
+        assert parser._parse_date_text(None) is None
+    
+    def test_invalid_date_tuples(self):
+        """测试残缺或类型错误的时间元组返回 None"""
+        parser = RSSParser()
+        
+        assert parser._parse_date((2024, 1, 2, 3, 4, 5)) == datetime(2024, 1, 2, 3, 4, 5)
+        assert parser._parse_date((2024, 13, 1, 0, 0, 0)) is None
+        assert parser._parse_date((2024, "1", 1, 0, 0, 0)) is None
+        assert parser._parse_date((2024, None, 1, 0, 0, 0)) is None
+        assert parser._parse_date((2024, 1)) is None
+        assert parser._parse_date(None) is None
+
+
+class TestClientLifecycle:
+    """测试共享客户端与事件循环的绑定"""
+    
+    def test_new_loop_replaces_client_with_warning(self, caplog):
+        """测试换了事件循环后丢弃旧客户端并记录警告"""
+        parser = RSSParser()
+        first = asyncio.run(parser._get_client())
+        
+        with caplog.at_level("WARNING", logger="app.services.rss"):
+            second = asyncio.run(parser._get_client())
+        asyncio.run(parser.aclose())
+        
+        assert second is not first
+        assert "rss_parser.aclose()" in caplog.text
+
+
+@pytest.mark.asyncio
+class TestFetchFeed:
+    """测试 fetch_feed"""
+    
+    async def test_streams_well_formed_feed(self):
+        """测试合法文档走增量解析"""
+        parser = mock_parser(ATOM_FEED, "application/atom+xml")
+        try:
+            items = await parser.fetch_feed("https://example.com/feed")
+        finally:
+            await parser.aclose()
+        
+        assert [item.link for item in items] == ["https://example.com/atom"]
+    
+    async def test_malformed_feed_falls_back_to_feedparser(self):
+        """测试非法 XML 回退到 feedparser"""
+        parser = mock_parser(MALFORMED_FEED)
+        try:
+            items = await parser.fetch_feed("https://example.com/feed")
+        finally:
+            await parser.aclose()
+        
+        assert len(items) == 1
+        assert items[0].title == "Still readable"
+        assert items[0].link == "https://example.com/broken"
+    
+    async def test_unknown_dialect_falls_back_to_feedparser(self):
+        """测试合法 XML 但没有识别出条目时交给 feedparser"""
+        parser = mock_parser(ATOM03_FEED, "application/atom+xml")
+        try:
+            items = await parser.fetch_feed("https://example.com/feed")
+        finally:
+            await parser.aclose()
+        
+        assert [item.title for item in items] == ["Old atom"]
+        assert [item.link for item in items] == ["https://example.com/atom03"]
+    
+    async def test_oversized_feed_refused(self, monkeypatch):
+        """测试超过大小上限的响应被拒绝"""
+        monkeypatch.setattr(rss, "MAX_FEED_BYTES", len(ATOM_FEED) - 1)
+        parser = mock_parser(ATOM_FEED, "application/atom+xml")
+        try:
+            items = await parser.fetch_feed("https://example.com/feed")
+        finally:
+            await parser.aclose()
+        
+        assert items == []
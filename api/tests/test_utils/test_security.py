@@ -0,0 +1,70 @@
+"""
+安全工具测试
+"""
+
+import time
+from types import SimpleNamespace
+
+import jose.jwt
+import pytest
+
+from app.utils import security
+from app.utils.security import create_access_token, verify_token
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可控时钟：同时驱动 verify_token 的缓存分桶和 jose 的 exp/nbf 校验"""
+    # 固定在某一分钟的第 30 秒，前后 20 秒都落在同一个缓存桶里
+    now = {"value": float(int(time.time()) // 60 * 60 + 30)}
+    security._verify_token_cached.cache_clear()
+    monkeypatch.setattr(security, "time", SimpleNamespace(time=lambda: now["value"]))
+    # jose 用 timegm(datetime.now(UTC)) 取当前时间
+    monkeypatch.setattr(jose.jwt, "timegm", lambda _: int(now["value"]))
+    yield now
+    security._verify_token_cached.cache_clear()
+
+
+def sign(claims: dict) -> str:
+    """按原样签发声明（create_access_token 会覆盖 exp）"""
+    secret, algorithm, _ = security._jwt_config()
+    return jose.jwt.encode(claims, secret, algorithm=algorithm)
+
+
+class TestVerifyToken:
+    """测试 verify_token 及其缓存"""
+    
+    def test_valid_token(self):
+        """测试合法令牌返回负载"""
+        token = create_access_token({"sub": "1"})
+        
+        payload = verify_token(token)
+        
+        assert payload["sub"] == "1"
+        # 缓存的负载是只读的
+        with pytest.raises(TypeError):
+            payload["sub"] = "2"
+    
+    def test_invalid_token(self):
+        """测试伪造的令牌被拒绝"""
+        assert verify_token("not-a-token") is None
+    
+    def test_expiry_inside_cached_bucket(self, clock):
+        """测试缓存命中后令牌过期仍被拒绝"""
+        start = clock["value"]
+        token = sign({"sub": "1", "exp": int(start) + 10})
+        
+        assert verify_token(token)["sub"] == "1"
+        
+        clock["value"] = start + 20
+        assert verify_token(token) is None
+    
+    def test_not_before_is_not_cached(self, clock):
+        """测试因 nbf 被拒的令牌在同一分钟内生效后可用"""
+        start = clock["value"]
+        token = sign({"sub": "1", "nbf": int(start) + 10, "exp": int(start) + 3600})
+        
+        assert verify_token(token) is None
+        
+        clock["value"] = start + 20
+        assert verify_token(token)["sub"] == "1"
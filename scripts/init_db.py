@@ -5,9 +5,11 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'api'))
 
-from app.core.db import Base, engine
+from app.core.db import Base, engine, upgrade_db
 
 if __name__ == "__main__":
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    # Existing databases: add columns introduced since they were created
+    upgrade_db()
     print("✓ Database initialized")
\ No newline at end of file
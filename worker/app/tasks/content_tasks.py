@@ -4,7 +4,7 @@ Content fetching and processing tasks
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import List
+from typing import Dict, List, Optional
 
 from celery import current_task
 from sqlalchemy import select
@@ -23,6 +23,7 @@ sys.path.insert(0, api_path)
 
 from app.models.source import Source, SourceStatus
 from app.models.item import Item
+from app.core.http import close_http_session
 from app.services.content_fetcher import ContentFetcher
 from app.services.content_processor import ContentProcessor
 
@@ -45,23 +46,19 @@ def fetch_all_sources(self):
         
         logger.info("Starting content fetch", sources_count=len(active_sources))
         
-        # Process sources in batches to avoid overwhelming the system
-        batch_size = 10
-        for i in range(0, len(active_sources), batch_size):
-            batch = active_sources[i:i + batch_size]
-            
-            # Update task progress
-            current_task.update_state(
-                state="PROGRESS",
-                meta={
-                    "current": i,
-                    "total": len(active_sources),
-                    "status": f"Processing batch {i//batch_size + 1}"
-                }
-            )
-            
-            # Process batch asynchronously
-            asyncio.run(process_source_batch(batch, db))
+        # Update task progress
+        current_task.update_state(
+            state="PROGRESS",
+            meta={
+                "current": 0,
+                "total": len(active_sources),
+                "status": "Fetching sources"
+            }
+        )
+        
+        # One event loop for the whole run: the fetcher's semaphore bounds
+        # concurrency and every source shares one connection pool
+        asyncio.run(process_sources(active_sources, db))
         
         db.close()
         
@@ -78,56 +75,90 @@ def fetch_all_sources(self):
         raise
 
 
-async def process_source_batch(sources: List[Source], db):
-    """Process a batch of sources concurrently"""
-    async with ContentFetcher() as fetcher:
-        tasks = []
-        for source in sources:
-            task = process_single_source(fetcher, source, db)
-            tasks.append(task)
-        
-        # Process all sources in batch concurrently
-        await asyncio.gather(*tasks, return_exceptions=True)
-
-
-async def process_single_source(fetcher: ContentFetcher, source: Source, db):
-    """Process a single source"""
+async def process_sources(sources: List[Source], db):
+    """Fetch all due sources concurrently, then store what came back"""
+    now = datetime.utcnow()
+    due_sources = [source for source in sources if is_source_due(source, now)]
+    if not due_sources:
+        return
+    
+    try:
+        async with ContentFetcher() as fetcher:
+            results = await fetcher.fetch_many(due_sources)
+    finally:
+        # The shared session is bound to this event loop, which asyncio.run closes
+        await close_http_session()
+    
+    # Store sequentially - the sync DB session is not safe to share across tasks
+    for source, result in zip(due_sources, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to fetch source", source_id=source.id, error=str(result))
+            source.record_error(str(result))
+            db.commit()
+            continue
+        
+        content_items, validators = result
+        save_source_items(source, content_items, db, validators)
+
+
+def is_source_due(source: Source, now: datetime) -> bool:
+    """Check if enough time has passed since last fetch"""
+    if source.last_fetched_at:
+        time_since_last = now - source.last_fetched_at
+        if time_since_last.total_seconds() < source.fetch_interval_minutes * 60:
+            logger.debug("Skipping source - too soon", source_id=source.id)
+            return False
+    return True
+
+
+def save_source_items(
+    source: Source,
+    content_items: List[dict],
+    db,
+    validators: Optional[Dict[str, Optional[str]]] = None
+):
+    """Store newly fetched items for a single source.
+    
+    HTTP cache validators are stored only after the items are committed,
+    so a failed save never makes the next poll skip them with a 304.
+    """
     try:
-        # Check if enough time has passed since last fetch
-        if source.last_fetched_at:
-            time_since_last = datetime.utcnow() - source.last_fetched_at
-            if time_since_last.total_seconds() < source.fetch_interval_minutes * 60:
-                logger.debug("Skipping source - too soon", source_id=source.id)
-                return
-        
-        # Fetch content
-        content_items = await fetcher.fetch_source_content(source)
-        
         if not content_items:
             logger.info("No new content found", source_id=source.id)
+            _set_cache_validators(source, validators)  # Nothing to lose here
+            db.commit()  # Keep fetch bookkeeping (last_fetched_at, etag)
             return
         
+        # Load the URLs we already have for this source in one query,
+        # instead of one SELECT per fetched item
+        fetched_urls = [item_data["url"] for item_data in content_items]
+        known_urls = {
+            url for (url,) in db.query(Item.url).filter(
+                Item.source_id == source.id,
+                Item.url.in_(fetched_urls)
+            )
+        }
+        
         # Save items to database
         new_items_count = 0
         for item_data in content_items:
-            # Check if item already exists
-            existing_item = db.query(Item).filter(
-                Item.url == item_data["url"],
-                Item.source_id == source.id
-            ).first()
-            
-            if existing_item:
+            if item_data["url"] in known_urls:
                 continue  # Skip existing items
             
             # Create new item
             item = Item(**item_data)
             db.add(item)
+            known_urls.add(item_data["url"])
             new_items_count += 1
         
         # Update source statistics
         source.total_items += new_items_count
         db.commit()
         
+        # Items are stored - only now is it safe to let the next poll 304
+        _set_cache_validators(source, validators)
+        db.commit()
+        
         logger.info(
             "Source processed successfully",
             source_id=source.id,
@@ -144,6 +175,13 @@ async def process_single_source(fetcher: ContentFetcher, source: Source, db):
         db.commit()
 
 
+def _set_cache_validators(source: Source, validators: Optional[Dict[str, Optional[str]]]):
+    """Remember the feed's ETag/Last-Modified for the next conditional GET"""
+    if validators is not None:
+        source.etag = validators["etag"]
+        source.last_modified = validators["last_modified"]
+
+
 @celery_app.task
 def process_source_items(source_id: int):
     """Process unprocessed items from a specific source"""
@@ -5,6 +5,7 @@ Notification and alert tasks
 from datetime import datetime
 from typing import List
 
+from sqlalchemy.orm import joinedload
 import structlog
 
 from app.celery_app import celery_app
@@ -18,6 +19,7 @@ sys.path.insert(0, api_path)
 
 from app.models.user import User
 from app.models.item import Item
+from app.models.source import Source
 
 logger = structlog.get_logger()
 
@@ -74,7 +76,10 @@ def send_important_item_alert(item_id: int):
         db_gen = get_sync_db()
         db = next(db_gen)
         
-        item = db.query(Item).filter(Item.id == item_id).first()
+        # Load source and owner with the item - avoids two lazy SELECTs below
+        item = db.query(Item).options(
+            joinedload(Item.source).joinedload(Source.user)
+        ).filter(Item.id == item_id).first()
         if not item:
             db.close()
             return